@@ -7,10 +7,19 @@ NocoDB MCP Server (fixed)
 """
 
 import os
+import re
+import hmac
+import hashlib
 import json
+import time
+import asyncio
+import functools
+import contextlib
+import importlib.util
+from dataclasses import dataclass
 import httpx
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Any
 from mcp.server.fastmcp import FastMCP, Context
 from starlette.applications import Starlette
 from starlette.responses import PlainTextResponse
@@ -20,16 +29,65 @@ import sys
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
 
+try:  # optional: faster JSON decoding straight from bytes
+    import orjson
+except ImportError:
+    orjson = None
+
+try:  # optional: typed decoding of the table listing used for name resolution
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# --- Config ---
+@dataclass(frozen=True, slots=True)
+class _Cfg:
+    """Env configuration, read once (the server never changes its env after boot)."""
+    url: str
+    token: str
+    base_id: str
+    auth_secret: bytes  # MCP_AUTH_TOKEN, pre-encoded for the constant-time compare
+    table_cache_ttl: float  # NOCODB_TABLE_CACHE_TTL: seconds table ids/schemas stay cached
+    max_concurrency: int  # NOCODB_MAX_CONCURRENCY: parallel NocoDB requests per tool call
+    bulk_chunk: int  # NOCODB_BULK_CHUNK: larger bulk payloads are split into concurrent requests
+
+def _env_at_least_one(name: str, default: str, cast: Callable[[str], Any]) -> Any:
+    value = cast(os.environ.get(name, default))
+    if value < 1:
+        raise ValueError(f"{name} must be at least 1, got {value!r}")
+    return value
+
+def _load_config() -> _Cfg:
+    return _Cfg(
+        url=(os.environ.get("NOCODB_URL") or "").rstrip("/"),
+        token=os.environ.get("NOCODB_API_TOKEN", ""),
+        base_id=os.environ.get("NOCODB_BASE_ID", ""),
+        auth_secret=os.environ.get("MCP_AUTH_TOKEN", "").encode(),
+        table_cache_ttl=_env_at_least_one("NOCODB_TABLE_CACHE_TTL", "300", float),
+        max_concurrency=_env_at_least_one("NOCODB_MAX_CONCURRENCY", "16", int),
+        bulk_chunk=_env_at_least_one("NOCODB_BULK_CHUNK", "100", int),
+    )
+
+_CFG = _load_config()
+
+def reload_config() -> None:
+    """Re-read the env vars (tests/dev only)."""
+    global _CFG
+    _CFG = _load_config()
+
 # --- Authorization: Bearer <MCP_AUTH_TOKEN> ---
+# секрет берём из _CFG, сравниваем байты за постоянное время
+_BEARER_PREFIX = b"bearer "
+
 class BearerAuthASGI:
     """
     Простая ASGI-мидлвара: проверяет Authorization: Bearer <MCP_AUTH_TOKEN>.
     Совместима со streaming/SSE.
     """
-    def __init__(self, app):
+    def __init__(self, app: Callable[..., Awaitable[None]]) -> None:
         self.app = app
 
-    async def __call__(self, scope, receive, send):
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
         # Только HTTP/SSE/WebSocket интересуют
         if scope["type"] not in ("http", "websocket"):
             return await self.app(scope, receive, send)
@@ -41,23 +99,25 @@ class BearerAuthASGI:
         if path == "/" and method in ("GET", "HEAD"):
             return await self.app(scope, receive, send)
 
-        secret = os.environ.get("MCP_AUTH_TOKEN")
-        if not secret:
+        if not _CFG.auth_secret:
             return await self._json(send, 500, {"error": "Server misconfigured: MCP_AUTH_TOKEN not set"})
 
-        # читаем заголовки
-        headers = {k.decode().lower(): v.decode() for k, v in scope.get("headers", [])}
-        auth = headers.get("authorization", "")
-        token = auth.split(" ", 1)[1].strip() if auth.lower().startswith("bearer ") else None
+        # ищем только Authorization (имена заголовков в ASGI уже в нижнем регистре)
+        auth = b""
+        for name, value in scope.get("headers", []):
+            if name == b"authorization":
+                auth = value
+                break
+        token = auth[7:].strip() if auth[:7].lower() == _BEARER_PREFIX else b""
 
-        if token != secret:
+        if not token or not hmac.compare_digest(token, _CFG.auth_secret):
             return await self._json(send, 401, {"error": "Unauthorized"})
 
         # пускаем дальше (SSE/стрим — ок)
         return await self.app(scope, receive, send)
 
-    async def _json(self, send, status, payload: dict):
-        body = json.dumps(payload).encode("utf-8")
+    async def _json(self, send: Callable, status: int, payload: Dict[str, Any]) -> None:
+        body = _dumps(payload)
         await send({
             "type": "http.response.start",
             "status": status,
@@ -77,28 +137,302 @@ mcp = FastMCP("NocoDB MCP Server", log_level="INFO")
 
 # ---------- Helpers ----------
 
+# NocoDB v2 endpoints, filled with %-formatting on the hot path
+_URL_BASE_TABLES = "/api/v2/meta/bases/%s/tables"
+_URL_META = "/api/v2/meta/tables/%s"
+_URL_RECORDS = "/api/v2/tables/%s/records"
+_URL_RECORD = "/api/v2/tables/%s/records/%s"
+_URL_BULK = "/api/v2/tables/%s/records/bulk"
+
 def _resolve_base_id(base_id: Optional[str]) -> str:
-    base = base_id or os.environ.get("NOCODB_BASE_ID")
+    base = base_id or _CFG.base_id
     if not base:
         raise ValueError("NocoDB Base ID is not provided (param base_id or ENV NOCODB_BASE_ID).")
     return base
 
+# ---------- Shared HTTP clients ----------
+# One pooled AsyncClient per (url, token): keeps TCP/TLS connections alive
+# across tool calls. Closed by the app lifespan on shutdown (see create_app).
+_CLIENTS: Dict[tuple, httpx.AsyncClient] = {}
+_CLIENTS_LOCK = asyncio.Lock()
+# HTTP/2 lets concurrent tool calls multiplex over one connection; needs the h2
+# package (httpx[http2]), otherwise httpx refuses http2=True, so fall back to HTTP/1.1.
+_HTTP2 = importlib.util.find_spec("h2") is not None
+# Meta JSON compresses well; only advertise br when httpx can decode it (brotli/brotlicffi)
+_ACCEPT_ENCODING = (
+    "br, gzip"
+    if importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi")
+    else "gzip"
+)
+
+async def _get_shared_client(url: str, token: str) -> httpx.AsyncClient:
+    key = (url, token)
+    client = _CLIENTS.get(key)
+    if client is not None and not client.is_closed:
+        return client
+    async with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None or client.is_closed:
+            headers = {"xc-token": token, "Content-Type": "application/json", "Accept-Encoding": _ACCEPT_ENCODING}
+            client = httpx.AsyncClient(
+                base_url=url,
+                headers=headers,
+                http2=_HTTP2,
+                timeout=30.0,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=60),
+            )
+            _CLIENTS[key] = client
+        return client
+
+async def close_nocodb_clients() -> None:
+    """Close all pooled NocoDB clients (called on app shutdown)."""
+    clients = list(_CLIENTS.values())
+    _CLIENTS.clear()
+    for client in clients:
+        await client.aclose()
+
 async def get_nocodb_client(
     nocodb_url: Optional[str] = None,
     api_token: Optional[str] = None,
 ) -> httpx.AsyncClient:
     """
-    Create an authenticated httpx AsyncClient for NocoDB.
+    Return a shared, authenticated httpx AsyncClient for NocoDB.
     Accepts params or falls back to env vars NOCODB_URL/NOCODB_API_TOKEN.
+    The client is pooled per (url, token) -- callers must NOT close it.
     """
-    url = (nocodb_url or os.environ.get("NOCODB_URL") or "").rstrip("/")
-    token = api_token or os.environ.get("NOCODB_API_TOKEN")
+    url = nocodb_url.rstrip("/") if nocodb_url else _CFG.url
+    token = api_token or _CFG.token
     if not url:
         raise ValueError("NocoDB URL is not provided (param nocodb_url or ENV NOCODB_URL).")
     if not token:
         raise ValueError("NocoDB API token is not provided (param api_token or ENV NOCODB_API_TOKEN).")
-    headers = {"xc-token": token, "Content-Type": "application/json"}
-    return httpx.AsyncClient(base_url=url, headers=headers, timeout=30.0)
+    return await _get_shared_client(url, token)
+
+# ---------- JSON responses ----------
+# Tools encode/decode NocoDB bodies as raw bytes: orjson when installed, stdlib json otherwise.
+_loads = orjson.loads if orjson is not None else json.loads
+
+def _dumps(obj: Any) -> bytes:
+    """
+    Pre-serialize a request body. Sent via content= (the client already sets
+    Content-Type: application/json), bypassing httpx's json.dumps + encode.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+async def _stream_get_json(
+    client: httpx.AsyncClient,
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+) -> Any:
+    """GET and decode the body straight from bytes (no intermediate str decode)."""
+    async with client.stream("GET", url, params=params) as resp:
+        await resp.aread()  # also lets HTTPStatusError handlers read e.response.text
+        resp.raise_for_status()
+        return _loads(resp.content)
+
+# ---------- Conditional metadata GETs ----------
+# (client base url, path) -> (upstream etag, raw body, content etag). Meta endpoints
+# change rarely, so refetches send If-None-Match and a 304 is answered from the stored body.
+_META_ETAG_CACHE: Dict[tuple, tuple] = {}
+
+def _content_etag(body: bytes) -> str:
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+async def _cached_meta_get(
+    client: httpx.AsyncClient,
+    url: str,
+    decode: Callable[[bytes], Any] = _loads,
+) -> Tuple[Any, str]:
+    """
+    Conditional GET for metadata. Returns (decode(body), etag) where etag is a hash of
+    the body, stable across NocoDB instances, that tools hand to callers for if_none_match.
+    """
+    key = (str(client.base_url), url)
+    cached = _META_ETAG_CACHE.get(key)
+    headers = {"If-None-Match": cached[0]} if cached else None
+    resp = await client.get(url, headers=headers)
+    if resp.status_code == 304 and cached:
+        return decode(cached[1]), cached[2]
+    resp.raise_for_status()
+    etag = _content_etag(resp.content)
+    if resp.headers.get("etag"):
+        _META_ETAG_CACHE[key] = (resp.headers["etag"], resp.content, etag)
+    return decode(resp.content), etag
+
+# ---------- Concurrency ----------
+
+async def _gather_bounded(coros: List[Any]) -> List[Any]:
+    """
+    Await independent NocoDB calls concurrently, in order, at most NOCODB_MAX_CONCURRENCY
+    at a time. The bound is per call, so concurrent tool calls don't queue behind each other.
+    A failing call yields an {"error": True, ...} dict instead of cancelling its siblings.
+    """
+    semaphore = asyncio.Semaphore(_CFG.max_concurrency)
+
+    async def _run(coro):
+        async with semaphore:
+            try:
+                return await coro
+            except httpx.HTTPStatusError as e:
+                return {"error": True, "status_code": e.response.status_code, "message": e.response.text}
+            except Exception as e:
+                return {"error": True, "message": str(e)}
+    return await asyncio.gather(*(_run(c) for c in coros))
+
+async def _send_bulk_chunks(send, items: List[Any]) -> Dict[str, Any]:
+    """
+    Split items into NOCODB_BULK_CHUNK-sized slices and send(slice) them concurrently.
+    Return shape: {"chunks": n, "results": [per-chunk response or error], "failed_chunks": [i, ...]}
+    """
+    size = _CFG.bulk_chunk
+    chunks = [items[i:i + size] for i in range(0, len(items), size)]
+    results = await _gather_bounded([send(chunk) for chunk in chunks])
+    failed = [i for i, r in enumerate(results) if isinstance(r, dict) and r.get("error")]
+    return {"chunks": len(chunks), "results": results, "failed_chunks": failed}
+
+# ---------- Table id cache ----------
+# (base_id, nocodb url, token) -> (cached_at, by_id, by_exact, by_norm). The three
+# dicts are built once per meta listing so resolving a name is a couple of dict probes,
+# and repeated tool calls skip the meta round-trip entirely. The url/token part (see
+# _client_key) keeps a mapping to callers holding the credentials that fetched it.
+_TABLE_ID_CACHE: Dict[tuple, Tuple[float, Dict[str, str], Dict[str, str], Dict[str, str]]] = {}
+_TABLE_ID_LOCKS: Dict[tuple, asyncio.Lock] = {}
+# (base_id, table_id, nocodb url, token) -> (cached_at, table meta, {column title/name: uidt}, etag).
+# Scoped per credential so a cached schema is never served to a caller NocoDB would reject.
+_SCHEMA_CACHE: Dict[tuple, tuple] = {}
+_NORM_TABLE = str.maketrans("", "", " _")
+
+def _client_key(client: httpx.AsyncClient) -> tuple:
+    """(NocoDB url, token) a pooled client talks to / authenticates with."""
+    return (str(client.base_url), client.headers.get("xc-token", ""))
+
+def _normalize_table_name(name: str) -> str:
+    return name.strip().lower().translate(_NORM_TABLE)
+
+def invalidate_table_cache(base_id: Optional[str] = None) -> None:
+    """
+    Drop cached table ids and schemas for one base (or for all bases if base_id is None).
+    Called on 404s so a renamed/dropped table is re-resolved on the next call.
+    """
+    if base_id is None:
+        _TABLE_ID_CACHE.clear()
+        _SCHEMA_CACHE.clear()
+        return
+    for key in [k for k in _TABLE_ID_CACHE if k[0] == base_id]:
+        _TABLE_ID_CACHE.pop(key, None)
+    for key in [k for k in _SCHEMA_CACHE if k[0] == base_id]:
+        _SCHEMA_CACHE.pop(key, None)
+
+def _cache_schema(
+    client: httpx.AsyncClient,
+    base: str,
+    table_id: str,
+    meta: Dict[str, Any],
+    etag: str,
+) -> None:
+    col_types: Dict[str, str] = {}
+    for col in meta.get("columns") or []:
+        for key in (col.get("title"), col.get("column_name")):
+            if key and col.get("uidt"):
+                col_types.setdefault(key, col["uidt"])
+    _SCHEMA_CACHE[(base, table_id, *_client_key(client))] = (time.monotonic(), meta, col_types, etag)
+
+def _cached_schema(client: httpx.AsyncClient, base: str, table_id: str) -> Optional[tuple]:
+    """Return (table meta, {column: uidt}, etag) if cached for this client's credentials and fresh."""
+    entry = _SCHEMA_CACHE.get((base, table_id, *_client_key(client)))
+    if entry is None or time.monotonic() - entry[0] >= _CFG.table_cache_ttl:
+        return None
+    return entry[1:]
+
+def _invalidate_on_404(e: httpx.HTTPStatusError, base_id: Optional[str]) -> None:
+    """
+    A 404 can mean the cached table id is stale (renamed/dropped table), so drop the
+    base's cache. A missing row ("Record ... not found") leaves the cache alone.
+    """
+    if e.response.status_code != 404:
+        return
+    body = e.response.text.lower()
+    if "record" in body and "table" not in body:
+        return
+    base = base_id or _CFG.base_id
+    if base:
+        invalidate_table_cache(base)
+
+# NocoDB v2 table ids: "m" + 14 lowercase alphanumerics (e.g. m8j4hjz1g6bw7pi)
+_TABLE_ID_RE = re.compile(r"^m[a-z0-9]{14}$")
+
+def _looks_like_table_id(name: str) -> bool:
+    # require a digit too, so a 15-letter lowercase table title isn't mistaken for an id
+    return bool(_TABLE_ID_RE.match(name)) and any(c.isdigit() for c in name)
+
+if msgspec is not None:
+    class _Table(msgspec.Struct):
+        id: Optional[str] = None
+        title: Optional[str] = None
+        table_name: Optional[str] = None
+        name: Optional[str] = None
+
+    class _TablesResp(msgspec.Struct):
+        list: List[_Table] = msgspec.field(default_factory=list)
+
+    _TABLES_DECODER = msgspec.json.Decoder(_TablesResp)
+else:
+    _TABLES_DECODER = None
+
+def _decode_table_keys(body: bytes) -> List[tuple]:
+    """
+    (id, title, table_name, name) per table -- all name resolution needs from the
+    listing. With msgspec, the other (large) per-table fields are skipped while decoding.
+    """
+    if _TABLES_DECODER is not None:
+        return [(t.id, t.title, t.table_name, t.name) for t in _TABLES_DECODER.decode(body).list]
+    return [
+        (t.get("id"), t.get("title"), t.get("table_name"), t.get("name"))
+        for t in _loads(body).get("list", [])
+    ]
+
+def _index_tables(tables: List[tuple]) -> Tuple[Dict[str, str], Dict[str, str], Dict[str, str]]:
+    by_id: Dict[str, str] = {}
+    by_exact: Dict[str, str] = {}
+    by_norm: Dict[str, str] = {}
+    for tid, *names in tables:
+        if not tid:
+            continue
+        by_id[tid] = tid
+        for cand in names:
+            if cand:
+                by_exact.setdefault(cand.strip(), tid)
+                by_norm.setdefault(_normalize_table_name(cand), tid)
+    return by_id, by_exact, by_norm
+
+def _cached_table_id(client: httpx.AsyncClient, base: str, table_name: str) -> Optional[str]:
+    entry = _TABLE_ID_CACHE.get((base, *_client_key(client)))
+    if entry is None or time.monotonic() - entry[0] >= _CFG.table_cache_ttl:
+        return None
+    _, by_id, by_exact, by_norm = entry
+    return (
+        by_id.get(table_name)
+        or by_exact.get(table_name.strip())
+        or by_norm.get(_normalize_table_name(table_name))
+    )
+
+async def _refresh_table_index(client: httpx.AsyncClient, base: str) -> List[tuple]:
+    tables, _ = await _cached_meta_get(client, _URL_BASE_TABLES % base, decode=_decode_table_keys)
+    _TABLE_ID_CACHE[(base, *_client_key(client))] = (time.monotonic(), *_index_tables(tables))
+    return tables
+
+async def _warm_table_cache() -> None:
+    """Index the configured base's tables at startup so first tool calls hit the cache."""
+    cfg = _CFG
+    if not (cfg.url and cfg.token and cfg.base_id):
+        return
+    try:
+        client = await get_nocodb_client()
+        await _refresh_table_index(client, cfg.base_id)
+    except Exception as e:
+        logger.warning("Table cache warm-up failed: %s", e)
 
 async def get_table_id(
     client: httpx.AsyncClient,
@@ -107,63 +441,288 @@ async def get_table_id(
 ) -> str:
     """
     Resolve a table name or id to the table id, within a base.
-    Tries exact id match, then title/table_name/name (case/underscore-insensitive).
+    Strings shaped like a NocoDB table id are returned as-is without a meta call;
+    otherwise tries exact id match, then title/table_name/name (case/underscore-insensitive).
+    Results are cached per base for NOCODB_TABLE_CACHE_TTL seconds (default 300).
     """
     base = _resolve_base_id(base_id)
-    resp = await client.get(f"/api/v2/meta/bases/{base}/tables")
-    resp.raise_for_status()
-    tables = resp.json().get("list", [])
-
-    # exact id match
-    for t in tables:
-        if t.get("id") == table_name:
-            return t["id"]
-
-    needle_raw = table_name.strip()
-    needle_norm = needle_raw.lower().replace("_", "").replace(" ", "")
-    for t in tables:
-        candidates = [
-            t.get("title") or "",
-            t.get("table_name") or t.get("name") or "",
-        ]
-        for cand in candidates:
-            cand_raw = (cand or "").strip()
-            if cand_raw == needle_raw:
-                return t["id"]
-            cand_norm = cand_raw.lower().replace("_", "").replace(" ", "")
-            if cand_norm == needle_norm:
-                return t["id"]
+    # fast path: already an id -- a wrong guess 404s downstream, which drops the cache
+    if _looks_like_table_id(table_name):
+        return table_name
+    cached = _cached_table_id(client, base, table_name)
+    if cached:
+        return cached
+
+    # single-flight: concurrent misses on the same base share one meta call
+    lock = _TABLE_ID_LOCKS.setdefault((base, *_client_key(client)), asyncio.Lock())
+    async with lock:
+        cached = _cached_table_id(client, base, table_name)
+        if cached:
+            return cached
+        tables = await _refresh_table_index(client, base)
+        cached = _cached_table_id(client, base, table_name)
+        if cached:
+            return cached
 
     raise ValueError(
         f"Table '{table_name}' not found in base '{base}'. "
-        f"Available: {[{'id': t.get('id'), 'title': t.get('title'), 'name': t.get('table_name') or t.get('name')} for t in tables]}"
+        f"Available: {[{'id': tid, 'title': title, 'name': table_name or name} for tid, title, table_name, name in tables]}"
     )
 
+async def _resolve_table(
+    client: httpx.AsyncClient,
+    base_id: Optional[str],
+    table_id: Optional[str],
+    table_name: Optional[str],
+) -> str:
+    """
+    Prefer an explicit table_id (no meta lookup when it has the id shape),
+    otherwise resolve table_name via get_table_id.
+    """
+    if table_id:
+        if _looks_like_table_id(table_id):
+            return table_id
+        return await get_table_id(client, base_id, table_id)
+    return await get_table_id(client, base_id, table_name)
+
+def _with_table_id(data: Any, table_id: str) -> Dict[str, Any]:
+    """Attach the resolved table id so callers can pass it back as table_id."""
+    if isinstance(data, dict):
+        data["table_id"] = table_id
+        return data
+    return {"list": data, "table_id": table_id}
+
+# Single NocoDB rows carry the resolved id under this key instead: NocoDB columns are
+# user-named, so "table_id" may be a real field. A row that has this key is left as-is.
+_ROW_TABLE_ID_KEY = "__table_id"
+
+def _record_with_table_id(record: Any, table_id: str) -> Dict[str, Any]:
+    """Like _with_table_id, for a single row returned at the top level."""
+    if isinstance(record, dict):
+        record.setdefault(_ROW_TABLE_ID_KEY, table_id)
+        return record
+    return _with_table_id(record, table_id)
+
+# ---------- Where-clause helpers ----------
+# Comparison ops accepted in lookups; a few are spelled differently by NocoDB.
+_ALLOWED_OPS = frozenset({"eq", "neq", "gt", "gte", "ge", "lt", "lte", "le", "like", "nlike", "in", "between", "btw"})
+_ALLOWED_OPS_SORTED = sorted(_ALLOWED_OPS)
+_NOCODB_OPS = {"gte": "ge", "lte": "le", "between": "btw"}
+# Characters that would break the (field,op,value) syntax unless quoted
+_WHERE_SPECIAL_RE = re.compile(r"[,()~']")
+_SQL_QUOTE_ESCAPE = str.maketrans({"'": "''"})
+# Field names are interpolated unquoted: reject anything that would break out of (field,op,value)
+_FIELD_RE = re.compile(r"[^\s,()~][^,()~\x00-\x1f]{0,254}")
+_COND_FMT = "({field},{op},{value})"
+# Composed `where` strings longer than this are split into per-lookup requests
+_WHERE_URL_LIMIT = 6 * 1024
+# NocoDB's default maximum page size for record listing
+_RECORDS_PAGE_MAX = 1000
+
+# NocoDB column types (uidt) whose values are compared as numbers / booleans
+_NUMERIC_UIDTS = frozenset({"Number", "Decimal", "Currency", "Percent", "Rating", "Duration", "AutoNumber", "ID", "Year"})
+_BOOLEAN_UIDTS = frozenset({"Checkbox"})
+
+def _quote_where_value(value: Any, col_type: Optional[str] = None) -> str:
+    """
+    Render one value for a `where` clause. With a known column type (uidt) the
+    formatting follows the column; otherwise it falls back to the Python type.
+    """
+    if value is None:
+        return "null"
+    if col_type in _NUMERIC_UIDTS and _as_number(value) is not None:
+        return str(value).strip()
+    if col_type in _BOOLEAN_UIDTS:
+        truthy = value if isinstance(value, bool) else str(value).strip().lower() in ("true", "1", "yes")
+        return "true" if truthy else "false"
+    if col_type is None and isinstance(value, bool):
+        return "true" if value else "false"
+    if col_type is None and isinstance(value, (int, float)):
+        return str(value)
+    s = str(value)
+    if s != s.strip() or _WHERE_SPECIAL_RE.search(s):
+        return "'" + s.translate(_SQL_QUOTE_ESCAPE) + "'"
+    return s
+
+def _fmt_value_for_where(value: Any, op: str, col_type: Optional[str] = None) -> str:
+    if op == "in":
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        return ",".join(_quote_where_value(v, col_type) for v in values)
+    if op in ("between", "btw"):
+        if not isinstance(value, (list, tuple)) or len(value) != 2:
+            raise ValueError(f"Op '{op}' expects a [low, high] pair, got {value!r}")
+        return f"{_quote_where_value(value[0], col_type)},{_quote_where_value(value[1], col_type)}"
+    return _quote_where_value(value, col_type)
+
+def _check_condition(field: Any, op: str) -> None:
+    if not field:
+        raise ValueError(f"Condition is missing 'field' (op '{op}').")
+    if not isinstance(field, str) or not _FIELD_RE.fullmatch(field):
+        raise ValueError(f"Invalid field name {field!r}: must not start with whitespace or contain , ( ) ~ or control characters.")
+    if op not in _ALLOWED_OPS:
+        raise ValueError(f"Unsupported op '{op}'. Allowed: {_ALLOWED_OPS_SORTED}")
+
+def _make_condition(cond: Dict[str, Any], col_type: Optional[str] = None) -> str:
+    field = cond.get("field")
+    op = cond.get("op") or "eq"
+    _check_condition(field, op)
+    return _COND_FMT.format_map({
+        "field": field,
+        "op": _NOCODB_OPS.get(op, op),
+        "value": _fmt_value_for_where(cond.get("value"), op, col_type),
+    })
+
+@functools.lru_cache(maxsize=256)
+def _compile_where(
+    fields_ops: tuple,
+    logic: str,
+    col_types: Optional[tuple] = None,
+) -> Callable[[tuple], str]:
+    """
+    Compile a renderer for one query shape ((field, op), ...) joined by `logic`.
+    The template is built once per shape; calls only format the values.
+    col_types, if given, holds the column uidt per condition (None = unknown).
+    """
+    if logic not in ("and", "or"):
+        raise ValueError(f"Unsupported logic '{logic}' (use 'and' or 'or').")
+    parts = []
+    for field, op in fields_ops:
+        _check_condition(field, op)
+        parts.append(_COND_FMT.format_map({
+            "field": field.replace("{", "{{").replace("}", "}}"),
+            "op": _NOCODB_OPS.get(op, op),
+            "value": "{}",
+        }))
+    template = f"~{logic}".join(parts)
+    ops = tuple(op for _, op in fields_ops)
+    types = col_types or (None,) * len(ops)
+
+    def render(values: tuple) -> str:
+        return template.format(*(_fmt_value_for_where(v, op, t) for v, op, t in zip(values, ops, types)))
+    return render
+
+def _build_where(conditions: List[Dict[str, Any]], logic: str = "and") -> str:
+    """
+    Build a NocoDB `where` string, e.g. (age,gt,30)~and(status,eq,active).
+    """
+    shape = tuple((c.get("field"), c.get("op") or "eq") for c in conditions)
+    return _compile_where(shape, logic)(tuple(c.get("value") for c in conditions))
+
+def _build_where_typed(
+    conditions: List[Dict[str, Any]],
+    schema: Dict[str, str],
+    logic: str = "and",
+) -> str:
+    """Like _build_where, but formats values by column type from a cached {column: uidt} schema."""
+    shape = tuple((c.get("field"), c.get("op") or "eq") for c in conditions)
+    col_types = tuple(schema.get(c.get("field")) for c in conditions)
+    return _compile_where(shape, logic, col_types)(tuple(c.get("value") for c in conditions))
+
+def _as_number(value: Any) -> Optional[float]:
+    if isinstance(value, bool) or value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def _values_equal(actual: Any, expected: Any) -> bool:
+    a, b = _as_number(actual), _as_number(expected)
+    if a is not None and b is not None:
+        return a == b
+    return str(actual).strip().casefold() == str(expected).strip().casefold()
+
+def _compare(actual: Any, expected: Any) -> int:
+    a, b = _as_number(actual), _as_number(expected)
+    if a is None or b is None:
+        a, b = str(actual).casefold(), str(expected).casefold()
+    return (a > b) - (a < b)
+
+def _row_matches(row: Dict[str, Any], cond: Dict[str, Any]) -> bool:
+    """
+    Client-side re-evaluation of a single condition, used to split the rows of
+    an OR-ed query back into per-lookup buckets. Deliberately lenient
+    (case-insensitive, numeric-aware) so rows NocoDB matched aren't dropped.
+    """
+    op = _NOCODB_OPS.get(cond.get("op") or "eq", cond.get("op") or "eq")
+    actual = row.get(cond["field"])
+    expected = cond.get("value")
+    if actual is None:
+        return expected is None and op == "eq"
+    if op == "eq":
+        return _values_equal(actual, expected)
+    if op == "neq":
+        return not _values_equal(actual, expected)
+    if op == "in":
+        values = expected if isinstance(expected, (list, tuple, set)) else [expected]
+        return any(_values_equal(actual, v) for v in values)
+    if op in ("like", "nlike"):
+        expected = str(expected)
+        if "%" not in expected:  # NocoDB treats a bare like value as "contains"
+            expected = f"%{expected}%"
+        pattern = "".join(".*" if ch == "%" else re.escape(ch) for ch in expected)
+        found = re.fullmatch(pattern, str(actual), re.IGNORECASE | re.DOTALL) is not None
+        return found if op == "like" else not found
+    if op == "btw":
+        return _compare(actual, expected[0]) >= 0 and _compare(actual, expected[1]) <= 0
+    cmp = _compare(actual, expected)
+    return {"gt": cmp > 0, "ge": cmp >= 0, "lt": cmp < 0, "le": cmp <= 0}[op]
+
 # ---------- Tools ----------
 
+# Fixed validation errors, built once and returned as-is
+_ERR_NO_TABLE = {"error": True, "message": "Table name or table_id is required"}
+_ERR_NO_DATA = {"error": True, "message": "Data is required"}
+_ERR_NO_UPDATE_DATA = {"error": True, "message": "Data parameter is required for updates"}
+_ERR_NO_UPDATE_IDS = {"error": True, "message": "Bulk IDs are required for bulk updates"}
+_ERR_NO_UPDATE_ROW = {"error": True, "message": "Row ID is required for single record update"}
+_ERR_NO_DELETE_IDS = {"error": True, "message": "Bulk IDs are required for bulk deletion"}
+_ERR_NO_DELETE_ROW = {"error": True, "message": "Row ID is required for single record deletion"}
+_ERR_NO_LOOKUPS = {"error": True, "message": "Lookups are required"}
+
+def _tool_call(fn):
+    """Shared error scaffolding for every tool: NocoDB HTTP errors and
+    any other failure come back as {"error": True, ...} dicts. functools.wraps
+    keeps the original signature visible to FastMCP."""
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await fn(*args, **kwargs)
+        except httpx.HTTPStatusError as e:
+            _invalidate_on_404(e, kwargs.get("base_id"))
+            return {"error": True, "status_code": e.response.status_code, "message": e.response.text}
+        except Exception as e:
+            return {"error": True, "message": str(e)}
+    return wrapper
+
 @mcp.tool()
+@_tool_call
 async def list_tables(
+    if_none_match: Optional[str] = None,
     nocodb_url: Optional[str] = None,
     api_token: Optional[str] = None,
     base_id: Optional[str] = None,
 ) -> dict:
     """
     List tables for the given base. Always returns a DICT to satisfy validators.
-    Return shape: {"tables": [...], "pageInfo": {...}}
+    Return shape: {"tables": [...], "pageInfo": {...}, "etag": "..."}
+    Each table's "id" can be passed as table_id to the other tools to skip name resolution.
+    Pass a previous "etag" as if_none_match to get {"not_modified": True, "etag": ...}
+    instead of the full listing when nothing changed.
     """
     client = await get_nocodb_client(nocodb_url, api_token)
     base = _resolve_base_id(base_id)
-    try:
-        resp = await client.get(f"/api/v2/meta/bases/{base}/tables")
-        resp.raise_for_status()
-        data = resp.json()  # {"list":[...], "pageInfo":{...}} in NocoDB v2
-        return {"tables": data.get("list", data), "pageInfo": data.get("pageInfo")}
-    finally:
-        await client.aclose()
+    # {"list":[...], "pageInfo":{...}} in NocoDB v2
+    data, etag = await _cached_meta_get(client, _URL_BASE_TABLES % base)
+    if if_none_match and if_none_match == etag:
+        return {"not_modified": True, "etag": etag}
+    return {"tables": data.get("list", data), "pageInfo": data.get("pageInfo"), "etag": etag}
 
 @mcp.tool()
+@_tool_call
 async def retrieve_records(
-    table_name: str,
+    table_name: Optional[str] = None,
+    table_id: Optional[str] = None,
     row_id: Optional[str] = None,
     filters: Optional[str] = None,
     limit: Optional[int] = 10,
@@ -178,40 +737,36 @@ async def retrieve_records(
 ) -> Dict[str, Any]:
     """
     Retrieve one or multiple records from a NocoDB table.
+    Pass table_id (from list_tables or a previous response) instead of table_name
+    to skip name resolution; every tool returns the resolved "table_id".
     """
-    if not table_name:
-        return {"error": True, "message": "Table name is required"}
+    if not (table_name or table_id):
+        return _ERR_NO_TABLE
 
     client = await get_nocodb_client(nocodb_url, api_token)
-    try:
-        table_id = await get_table_id(client, base_id, table_name)
-
-        if row_id:
-            url = f"/api/v2/tables/{table_id}/records/{row_id}"
-            response = await client.get(url)
-        else:
-            url = f"/api/v2/tables/{table_id}/records"
-            params = {}
-            if limit is not None: params["limit"] = limit
-            if offset is not None: params["offset"] = offset
-            if sort: params["sort"] = sort
-            if fields: params["fields"] = fields
-            if filters: params["where"] = filters
-            response = await client.get(url, params=params)
-
-        response.raise_for_status()
-        return response.json()
-    except httpx.HTTPStatusError as e:
-        return {"error": True, "status_code": e.response.status_code, "message": e.response.text}
-    except Exception as e:
-        return {"error": True, "message": str(e)}
-    finally:
-        await client.aclose()
+    table_id = await _resolve_table(client, base_id, table_id, table_name)
+
+    if row_id:
+        url = _URL_RECORD % (table_id, row_id)
+        params = None
+    else:
+        url = _URL_RECORDS % table_id
+        params = {}
+        if limit is not None: params["limit"] = limit
+        if offset is not None: params["offset"] = offset
+        if sort: params["sort"] = sort
+        if fields: params["fields"] = fields
+        if filters: params["where"] = filters
+
+    data = await _stream_get_json(client, url, params)
+    return _record_with_table_id(data, table_id) if row_id else _with_table_id(data, table_id)
 
 @mcp.tool()
+@_tool_call
 async def create_records(
-    table_name: str,
-    data: Any,
+    table_name: Optional[str] = None,
+    table_id: Optional[str] = None,
+    data: Any = None,
     bulk: bool = False,
 
     nocodb_url: Optional[str] = None,
@@ -222,10 +777,10 @@ async def create_records(
     """
     Create one or multiple records.
     """
-    if not table_name:
-        return {"error": True, "message": "Table name is required"}
+    if not (table_name or table_id):
+        return _ERR_NO_TABLE
     if data is None:
-        return {"error": True, "message": "Data is required"}
+        return _ERR_NO_DATA
 
     # Normalize bulk data
     if bulk and not isinstance(data, list):
@@ -234,25 +789,36 @@ async def create_records(
         data = data[0] if data else {}
 
     client = await get_nocodb_client(nocodb_url, api_token)
-    try:
-        table_id = await get_table_id(client, base_id, table_name)
-        if bulk:
-            url = f"/api/v2/tables/{table_id}/records/bulk"
-        else:
-            url = f"/api/v2/tables/{table_id}/records"
-        resp = await client.post(url, json=data)
-        resp.raise_for_status()
-        return resp.json()
-    except httpx.HTTPStatusError as e:
-        return {"error": True, "status_code": e.response.status_code, "message": e.response.text}
-    except Exception as e:
-        return {"error": True, "message": str(e)}
-    finally:
-        await client.aclose()
+    table_id = await _resolve_table(client, base_id, table_id, table_name)
+    if bulk:
+        url = _URL_BULK % table_id
+        if len(data) > _CFG.bulk_chunk:
+            async def _post(chunk):
+                r = await client.post(url, content=_dumps(chunk))
+                r.raise_for_status()
+                return _loads(r.content)
+
+            out = await _send_bulk_chunks(_post, data)
+            # created ids in input order; rows of a failed chunk are None so positions line up
+            size = _CFG.bulk_chunk
+            out["list"] = [
+                row
+                for i, r in enumerate(out["results"])
+                for row in (r if isinstance(r, list) else [None] * len(data[i * size:(i + 1) * size]))
+            ]
+            return _with_table_id(out, table_id)
+    else:
+        url = _URL_RECORDS % table_id
+    resp = await client.post(url, content=_dumps(data))
+    resp.raise_for_status()
+    data = _loads(resp.content)
+    return _with_table_id(data, table_id) if bulk else _record_with_table_id(data, table_id)
 
 @mcp.tool()
+@_tool_call
 async def update_records(
-    table_name: str,
+    table_name: Optional[str] = None,
+    table_id: Optional[str] = None,
     row_id: Optional[str] = None,
     data: Optional[Dict[str, Any]] = None,
     bulk: bool = False,
@@ -266,37 +832,40 @@ async def update_records(
     """
     Update one or multiple records.
     """
-    if not table_name:
-        return {"error": True, "message": "Table name is required"}
+    if not (table_name or table_id):
+        return _ERR_NO_TABLE
     if not data:
-        return {"error": True, "message": "Data parameter is required for updates"}
+        return _ERR_NO_UPDATE_DATA
     if bulk and not bulk_ids:
-        return {"error": True, "message": "Bulk IDs are required for bulk updates"}
+        return _ERR_NO_UPDATE_IDS
     if (not bulk) and not row_id:
-        return {"error": True, "message": "Row ID is required for single record update"}
+        return _ERR_NO_UPDATE_ROW
 
     client = await get_nocodb_client(nocodb_url, api_token)
-    try:
-        table_id = await get_table_id(client, base_id, table_name)
-        if bulk and bulk_ids:
-            url = f"/api/v2/tables/{table_id}/records/bulk"
-            payload = {"ids": bulk_ids, "data": data}
-            resp = await client.patch(url, json=payload)
-        else:
-            url = f"/api/v2/tables/{table_id}/records/{row_id}"
-            resp = await client.patch(url, json=data)
-        resp.raise_for_status()
-        return resp.json()
-    except httpx.HTTPStatusError as e:
-        return {"error": True, "status_code": e.response.status_code, "message": e.response.text}
-    except Exception as e:
-        return {"error": True, "message": str(e)}
-    finally:
-        await client.aclose()
+    table_id = await _resolve_table(client, base_id, table_id, table_name)
+    if bulk and bulk_ids:
+        url = _URL_BULK % table_id
+        if len(bulk_ids) > _CFG.bulk_chunk:
+            async def _patch(ids):
+                r = await client.patch(url, content=_dumps({"ids": ids, "data": data}))
+                r.raise_for_status()
+                return _loads(r.content)
+
+            return _with_table_id(await _send_bulk_chunks(_patch, bulk_ids), table_id)
+        payload = {"ids": bulk_ids, "data": data}
+        resp = await client.patch(url, content=_dumps(payload))
+    else:
+        url = _URL_RECORD % (table_id, row_id)
+        resp = await client.patch(url, content=_dumps(data))
+    resp.raise_for_status()
+    data = _loads(resp.content)
+    return _with_table_id(data, table_id) if bulk else _record_with_table_id(data, table_id)
 
 @mcp.tool()
+@_tool_call
 async def delete_records(
-    table_name: str,
+    table_name: Optional[str] = None,
+    table_id: Optional[str] = None,
     row_id: Optional[str] = None,
     bulk: bool = False,
     bulk_ids: Optional[List[str]] = None,
@@ -309,96 +878,237 @@ async def delete_records(
     """
     Delete one or multiple records.
     """
-    if not table_name:
-        return {"error": True, "message": "Table name is required"}
+    if not (table_name or table_id):
+        return _ERR_NO_TABLE
     if bulk and not bulk_ids:
-        return {"error": True, "message": "Bulk IDs are required for bulk deletion"}
+        return _ERR_NO_DELETE_IDS
     if (not bulk) and not row_id:
-        return {"error": True, "message": "Row ID is required for single record deletion"}
+        return _ERR_NO_DELETE_ROW
 
     client = await get_nocodb_client(nocodb_url, api_token)
+    table_id = await _resolve_table(client, base_id, table_id, table_name)
+    if bulk and bulk_ids:
+        url = _URL_BULK % table_id
+        if len(bulk_ids) > _CFG.bulk_chunk:
+            async def _delete(ids):
+                r = await client.request("DELETE", url, content=_dumps({"ids": ids}))
+                r.raise_for_status()
+                return _loads(r.content) if r.content else {"success": True}
+
+            return _with_table_id(await _send_bulk_chunks(_delete, bulk_ids), table_id)
+        resp = await client.request("DELETE", url, content=_dumps({"ids": bulk_ids}))
+    else:
+        url = _URL_RECORD % (table_id, row_id)
+        resp = await client.delete(url)
+    resp.raise_for_status()
+    # 204 no content -> fabricate success json
+    if resp.status_code == 204:
+        return {"success": True, "message": "Record(s) deleted successfully", "table_id": table_id}
     try:
-        table_id = await get_table_id(client, base_id, table_name)
-        if bulk and bulk_ids:
-            url = f"/api/v2/tables/{table_id}/records/bulk"
-            resp = await client.request("DELETE", url, json={"ids": bulk_ids})
-        else:
-            url = f"/api/v2/tables/{table_id}/records/{row_id}"
-            resp = await client.delete(url)
-        resp.raise_for_status()
-        # 204 no content -> fabricate success json
-        if resp.status_code == 204:
-            return {"success": True, "message": "Record(s) deleted successfully"}
-        try:
-            data = resp.json()
-            if isinstance(data, (int, float)):
-                return {"success": True, "message": f"{int(data)} record(s) deleted successfully"}
-            if not isinstance(data, dict):
-                return {"success": True, "message": "Record(s) deleted successfully", "response_data": data}
-            return data
-        except json.JSONDecodeError:
-            return {"success": True, "message": "Record(s) deleted successfully (non-JSON response)"}
-    except httpx.HTTPStatusError as e:
-        return {"error": True, "status_code": e.response.status_code, "message": e.response.text}
-    except Exception as e:
-        return {"error": True, "message": str(e)}
-    finally:
-        await client.aclose()
+        data = _loads(resp.content)
+        if isinstance(data, (int, float)):
+            return {"success": True, "message": f"{int(data)} record(s) deleted successfully", "table_id": table_id}
+        if not isinstance(data, dict):
+            return {"success": True, "message": "Record(s) deleted successfully", "response_data": data, "table_id": table_id}
+        return _with_table_id(data, table_id) if bulk else _record_with_table_id(data, table_id)
+    except json.JSONDecodeError:  # orjson.JSONDecodeError subclasses it
+        return {"success": True, "message": "Record(s) deleted successfully (non-JSON response)", "table_id": table_id}
 
 @mcp.tool()
+@_tool_call
 async def get_schema(
-    table_name: str,
+    table_name: Optional[str] = None,
+    table_id: Optional[str] = None,
+    if_none_match: Optional[str] = None,
     nocodb_url: Optional[str] = None,
     api_token: Optional[str] = None,
     base_id: Optional[str] = None,
     ctx: Context = None,
 ) -> Dict[str, Any]:
     """
-    Retrieve table schema (columns) for a table.
+    Retrieve table schema (columns) for a table. The response carries an "etag";
+    pass it back as if_none_match to get {"not_modified": True, ...} when unchanged.
+    Cached per table for NOCODB_TABLE_CACHE_TTL seconds; find_by_fields_bulk uses the
+    cached column types to format its `where` values.
     """
-    if not table_name:
-        return {"error": True, "message": "Table name is required"}
+    if not (table_name or table_id):
+        return _ERR_NO_TABLE
 
     client = await get_nocodb_client(nocodb_url, api_token)
-    try:
-        table_id = await get_table_id(client, base_id, table_name)
-        url = f"/api/v2/meta/tables/{table_id}"
-        resp = await client.get(url)
-        resp.raise_for_status()
-        return resp.json()
-    except httpx.HTTPStatusError as e:
-        return {"error": True, "status_code": e.response.status_code, "message": e.response.text}
-    except Exception as e:
-        return {"error": True, "message": str(e)}
-    finally:
-        await client.aclose()
+    table_id = await _resolve_table(client, base_id, table_id, table_name)
+    # an id-shaped table_id needs no base; without one the schema just isn't cached
+    base = base_id or _CFG.base_id
+    cached = _cached_schema(client, base, table_id) if base else None
+    if cached:
+        meta, _, etag = cached
+    else:
+        meta, etag = await _cached_meta_get(client, _URL_META % table_id)
+        if base:
+            _cache_schema(client, base, table_id, meta, etag)
+    if if_none_match and if_none_match == etag:
+        return {"not_modified": True, "etag": etag, "table_id": table_id}
+    return _with_table_id({**meta, "etag": etag}, table_id)
 
 # ---------- New Tools ----------
 
+@mcp.tool()
+@_tool_call
+async def find_by_fields_bulk(
+    table_name: Optional[str] = None,
+    table_id: Optional[str] = None,
+    lookups: Optional[List[Dict[str, Any]]] = None,
+    fields: Optional[str] = None,
+    limit_per: int = 1,
+
+    nocodb_url: Optional[str] = None,
+    api_token: Optional[str] = None,
+    base_id: Optional[str] = None,
+    ctx: Context = None,
+) -> Dict[str, Any]:
+    """
+    Run many single-condition lookups against one table in one request.
+    Each lookup is {"field": ..., "op": "eq", "value": ...}; ops: eq, neq, gt, gte, lt,
+    lte, like, nlike, in (value is a list), between (value is [low, high]).
+    Lookups are OR-ed into a single `where` and the rows are bucketed back per lookup
+    (at most limit_per rows each).
+    Return shape: {"results": [{"lookup": {...}, "rows": [...]}, ...]}
+    """
+    if not (table_name or table_id):
+        return _ERR_NO_TABLE
+    if not lookups:
+        return _ERR_NO_LOOKUPS
+    limit_per = max(1, limit_per)
+
+    client = await get_nocodb_client(nocodb_url, api_token)
+    table_id = await _resolve_table(client, base_id, table_id, table_name)
+    url = _URL_RECORDS % table_id
+    base = base_id or _CFG.base_id
+    cached = _cached_schema(client, base, table_id) if base else None  # optional formatting hint
+    col_types = cached[1] if cached else None
+    if fields:
+        # bucketing needs the lookup fields in every row
+        wanted = [f.strip() for f in fields.split(",") if f.strip()]
+        for lookup in lookups:
+            if lookup.get("field") and lookup["field"] not in wanted:
+                wanted.append(lookup["field"])
+        fields = ",".join(wanted)
+
+    if col_types:
+        where = _build_where_typed(lookups, col_types, logic="or")
+    else:
+        where = _build_where(lookups, logic="or")
+
+    async def _lookup_rows(lookup):
+        col_type = col_types.get(lookup.get("field")) if col_types else None
+        params = {"where": _make_condition(lookup, col_type), "limit": limit_per}
+        if fields: params["fields"] = fields
+        resp = await client.get(url, params=params)
+        resp.raise_for_status()
+        return _loads(resp.content).get("list", [])
+
+    async def _requery(indexes):
+        # one request per lookup, concurrently; failures become per-lookup errors
+        for i, rows in zip(indexes, await _gather_bounded([_lookup_rows(lookups[i]) for i in indexes])):
+            if isinstance(rows, dict):
+                results[i] = {"lookup": lookups[i], "rows": [], **rows}
+            else:
+                results[i] = {"lookup": lookups[i], "rows": rows}
+
+    limit = len(lookups) * limit_per
+    if len(where) <= _WHERE_URL_LIMIT and limit <= _RECORDS_PAGE_MAX:
+        params = {"where": where, "limit": limit}
+        if fields: params["fields"] = fields
+        resp = await client.get(url, params=params)
+        resp.raise_for_status()
+        rows = _loads(resp.content).get("list", [])
+        # rows are keyed by column title, lookups may name the column_name instead
+        titles = {c.get("column_name"): c.get("title") for c in cached[0].get("columns") or []} if cached else {}
+        results = []
+        short = []
+        for i, lookup in enumerate(lookups):
+            field = lookup.get("field")
+            if rows and field not in rows[0]:
+                field = titles.get(field)
+                if field not in rows[0]:  # can't bucket client-side: ask NocoDB per lookup
+                    results.append(None)
+                    short.append(i)
+                    continue
+                lookup = {**lookup, "field": field}
+            matched = [r for r in rows if _row_matches(r, lookup)][:limit_per]
+            results.append({"lookup": lookups[i], "rows": matched})
+            if len(rows) >= limit and len(matched) < limit_per:
+                # full page: a broad lookup may have crowded out this one's matches
+                short.append(i)
+        if short:
+            await _requery(short)
+    else:
+        # composed query too large for one URL/page
+        results = [None] * len(lookups)
+        await _requery(range(len(lookups)))
+    return {"results": results, "table_id": table_id}
+
 
 
 # ---------- Starlette app (health + SSE) ----------
 
+# Static body/headers, so one instance can be sent for every health check
+_HEALTH_RESPONSE = PlainTextResponse("ok", headers={"Cache-Control": "no-store"})
+_APP: Optional[BearerAuthASGI] = None
+
+async def health(_req):
+    return _HEALTH_RESPONSE
+
+@contextlib.asynccontextmanager
+async def _lifespan(_app):
+    # warm in the background so health checks aren't blocked on NocoDB
+    warm_up = asyncio.create_task(_warm_table_cache())
+    yield
+    warm_up.cancel()
+    await close_nocodb_clients()  # drain pooled NocoDB connections
+
 def create_app():
+    """Build the ASGI app once; later calls (e.g. reloaders) reuse it."""
+    global _APP
+    if _APP is not None:
+        return _APP
     mcp_sse = mcp.sse_app()  # exposes /sse
-    async def health(_req):
-        return PlainTextResponse("ok")
-    app = Starlette(routes=[
-        Route("/", health, methods=["GET", "HEAD"]),
-        Mount("/", app=mcp_sse),
-    ])
-    if hasattr(app.router, "redirect_slashes"):
-        app.router.redirect_slashes = False
-    app = BearerAuthASGI(app)    
-    return app
-    
+    app = Starlette(
+        routes=[
+            Route("/", health, methods=["GET", "HEAD"]),
+            Mount("/", app=mcp_sse),
+        ],
+        lifespan=_lifespan,
+    )
+    app.router.redirect_slashes = False
+    _APP = BearerAuthASGI(app)
+    return _APP
+
+
+# C implementations when installed (uvloop has no Windows build), otherwise uvicorn's default
+_UVICORN_LOOP = "uvloop" if importlib.util.find_spec("uvloop") else "auto"
+_UVICORN_HTTP = "httptools" if importlib.util.find_spec("httptools") else "auto"
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8080))
     print(f"Python version: {sys.version}")
     print("Starting NocoDB MCP server (fixed)")
     print(f"Env NOCODB_URL set: {'NOCODB_URL' in os.environ}")
-    uvicorn.run(create_app(), host="0.0.0.0", port=port)
+    workers = int(os.environ.get("WEB_CONCURRENCY", "1"))
+    # access logs are off on the hot path; NOCODB_MCP_ACCESS_LOG=1 re-enables them for debugging
+    access_log = os.environ.get("NOCODB_MCP_ACCESS_LOG", "").lower() in ("1", "true", "yes")
+    uvicorn.run(
+        # multiple workers need an import string; each worker builds its own app
+        "nocodb_mcp_server:create_app" if workers > 1 else create_app(),
+        factory=workers > 1,
+        host="0.0.0.0",
+        port=port,
+        loop=_UVICORN_LOOP,
+        http=_UVICORN_HTTP,
+        access_log=access_log,
+        log_level="warning",
+        timeout_keep_alive=75,  # outlive typical LB idle timeouts so SSE streams aren't cut
+        workers=workers,
+    )
 
 
 